@@ -1,14 +1,30 @@
 import os
+import io
+import asyncio
 import requests
 import uvicorn
-from fastapi import FastAPI, HTTPException, Body
-from pydantic import BaseModel
+import httpx
+import aiohttp
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Body, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, confloat
 from enum import Enum
 from typing import List, Dict, Optional
-import json
-import re
+import orjson
+import hashlib
 import logging
-# import ollama
+import re
+import time
+from collections import OrderedDict
+import openai
+import ollama
+import tenacity
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -20,6 +36,81 @@ OLLAMA_API_URL = "http://localhost:11434/api/"
 # OpenAI API Key
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# OpenAI model for the "chatGPT" path. gpt-4o-mini is ~10x cheaper and several
+# times faster than gpt-4 at comparable grading quality. (Automatic prompt
+# caching does not apply here: it needs a stable prefix of at least 1024
+# tokens, and the trimmed system message is well under that.)
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+# Chat completions go over raw aiohttp (see call_openai); the SDK client is
+# kept for the file/batch endpoints only
+OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+# Max concurrent LLM calls per /rate_batch request (respects provider rate limits)
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "20"))
+
+# Worker count for the __main__ entrypoint. Every worker process imports this
+# module and computes the same value, so per-process state can account for it.
+WORKERS = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+
+# OpenAI account rate limits; calls wait in a token bucket instead of bursting
+# into 429s and losing wall-clock to retry backoff. The buckets are
+# per-process, so each worker gets an equal share of the account-wide budget.
+OPENAI_RPM = int(os.getenv("OPENAI_RPM", "500"))
+OPENAI_TPM = int(os.getenv("OPENAI_TPM", "200000"))
+
+# Match the Ollama server's request parallelism (see start_server.sh); extra
+# calls would just queue inside Ollama, so queue them here instead
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+ollama_semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+
+# In-memory LRU of past ratings; identical resubmissions skip the LLM
+# entirely. Per worker process, so a repeat landing on a different worker
+# misses — an acceptable trade against running a shared cache service.
+RATING_CACHE_SIZE = int(os.getenv("RATING_CACHE_SIZE", "4096"))
+rating_cache: OrderedDict = OrderedDict()
+
+# Single-flight map: concurrent duplicates await the first call's future
+# instead of issuing their own LLM round-trip (the LRU only covers calls
+# that have already completed). Also per worker process — duplicates
+# routed to different workers still each call the provider once.
+inflight: Dict[str, asyncio.Future] = {}
+
+# Connection pool settings shared by both LLM clients (keep-alive across requests)
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+HTTP_TIMEOUT = 60
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create one async client per provider at startup and close it on shutdown.
+
+    Building a client per request pays a fresh TLS handshake and connection
+    pool each time; sharing them keeps connections alive across /rate calls.
+    """
+    app.state.openai_client = openai.AsyncOpenAI(
+        api_key=OPENAI_API_KEY,
+        http_client=httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+    ) if OPENAI_API_KEY else None
+    app.state.ollama_client = ollama.AsyncClient(
+        limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT
+    )
+    app.state.http_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=200, ttl_dns_cache=300),
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+    )
+    # Pre-load llama3.2 so the first real /rate doesn't pay the model-load cost
+    try:
+        await app.state.ollama_client.generate(model="llama3.2", prompt="", keep_alive="24h")
+    except Exception as e:
+        logger.warning(f"Ollama warm-up failed (is 'ollama serve' running?): {str(e)}")
+    try:
+        yield
+    finally:
+        if app.state.openai_client is not None:
+            await app.state.openai_client.close()
+        await app.state.ollama_client._client.aclose()
+        await app.state.http_session.close()
+
 # Define the task types
 class TaskType(str, Enum):
     TASK1 = "task1"  # Letter writing
@@ -32,17 +123,25 @@ class WritingSubmission(BaseModel):
     response: str
     model: str  # New field for selecting model ("chatGPT" or "llama3.2")
 
-# Rating criteria models
+class BatchSubmission(BaseModel):
+    items: List[WritingSubmission]
+
+# Rating criteria models (IELTS band scores run 0-9). Frozen so cached
+# instances can be shared across requests without defensive copies.
 class Criterion(BaseModel):
-    score: float
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    score: confloat(ge=0, le=9)
     feedback: str
 
 class DetailedRating(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     task_achievement: Criterion
     coherence_cohesion: Criterion
     lexical_resource: Criterion
     grammatical_range: Criterion
-    overall_score: float
+    overall_score: confloat(ge=0, le=9)
     overall_feedback: str
 
 # Response model
@@ -54,123 +153,318 @@ class RatingResponse(BaseModel):
 app = FastAPI(
     title="IELTS Writing Rating API",
     description="API for rating IELTS General Training writing tasks using OpenAI or Ollama",
-    version="1.1.0"
+    version="1.1.0",
+    lifespan=lifespan
 )
 
+# Static prompt pieces built once at import time. All fixed instructions live
+# in the system message; the user prompt carries only the per-submission
+# fields and the JSON shape.
+SYSTEM_MESSAGE = (
+    "You are a certified IELTS examiner. Score the submission against the official IELTS writing criteria:\n"
+    "- Task Achievement (Task 1) / Task Response (Task 2): relevance, clarity, completeness.\n"
+    "- Coherence & Cohesion: logical organization, paragraphing, linking words.\n"
+    "- Lexical Resource: vocabulary range, accuracy, appropriateness.\n"
+    "- Grammatical Range & Accuracy: sentence variety, correctness.\n"
+    "Rate fairly by IELTS standards, avoiding extreme scores unless justified. "
+    "Give concise feedback per category covering both strengths and weaknesses. "
+    "Assign band scores 0-9 in 0.5 increments. Respond ONLY with JSON."
+)
+
+PROMPT_TEMPLATE = """### Task Type:
+{task_type}
+
+### Task Question:
+{question}
+
+### Student Response ({word_count} words):
+{response}
+
+### Return JSON in exactly this shape:
+{{
+"task_achievement": {{"score": 0.0, "feedback": "..."}},
+"coherence_cohesion": {{"score": 0.0, "feedback": "..."}},
+"lexical_resource": {{"score": 0.0, "feedback": "..."}},
+"grammatical_range": {{"score": 0.0, "feedback": "..."}},
+"overall_score": 0.0,
+"overall_feedback": "..."
+}}"""
+
+_WORD_RE = re.compile(r"\S+")
+
 def count_words(text: str) -> int:
-    """Count the number of words in a text."""
-    return len(text.split())
+    """Count the number of words in a text without building a throwaway list."""
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
+if tiktoken is not None:
+    try:
+        _TOKEN_ENCODER = tiktoken.encoding_for_model(OPENAI_MODEL)
+    except KeyError:
+        _TOKEN_ENCODER = tiktoken.get_encoding("o200k_base")
+else:
+    _TOKEN_ENCODER = None
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a prompt for rate-limit accounting."""
+    if _TOKEN_ENCODER is not None:
+        return len(_TOKEN_ENCODER.encode(text))
+    return len(text) // 4 + 1  # ~4 chars per token without tiktoken
+
+class TokenBucket:
+    """Async token bucket refilled continuously at a per-minute rate.
+
+    acquire() debits the bucket, sleeping until enough budget has refilled,
+    so callers pace themselves up to the limit instead of bursting into 429s.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0):
+        if amount > self.capacity:
+            # A full bucket could never satisfy this; admit the call at
+            # full-bucket cost instead of sleep-looping forever
+            logger.warning(f"TokenBucket acquire of {amount:.0f} exceeds capacity {self.capacity:.0f}; clamping")
+            amount = self.capacity
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+openai_rpm_bucket = TokenBucket(max(OPENAI_RPM // WORKERS, 1))
+openai_tpm_bucket = TokenBucket(max(OPENAI_TPM // WORKERS, 1))
+
+def _is_transient_llm_error(exc: BaseException) -> bool:
+    """Whether an LLM call failure is worth retrying (rate limit, timeout, 5xx)."""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status == 429 or exc.status >= 500
+    if isinstance(exc, (aiohttp.ClientConnectionError, asyncio.TimeoutError,
+                        httpx.ReadTimeout)):
+        return True
+    if isinstance(exc, ollama.ResponseError):
+        return exc.status_code >= 500
+    return False
+
+# Exponential backoff with jitter; transient provider errors succeed after a
+# short wait instead of surfacing as 500s
+llm_retry = tenacity.retry(
+    stop=tenacity.stop_after_attempt(4),
+    wait=tenacity.wait_exponential_jitter(initial=1, max=20),
+    retry=tenacity.retry_if_exception(_is_transient_llm_error),
+    reraise=True
+)
+
+class _JsonDepthScanner:
+    """Tracks brace depth across streamed JSON fragments.
+
+    Braces inside string values (and escaped quotes) are ignored, so a
+    feedback sentence containing "}" can't close the object early.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.opened = False
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, fragment: str) -> bool:
+        """Consume a fragment; True once the top-level object has closed."""
+        for ch in fragment:
+            if self._escaped:
+                self._escaped = False
+            elif self._in_string:
+                if ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == '{':
+                self.depth += 1
+                self.opened = True
+            elif ch == '}':
+                self.depth -= 1
+        return self.opened and self.depth == 0
+
+@llm_retry
+async def call_openai(http_session, prompt: str) -> str:
+    """Issue one ChatGPT completion over raw HTTP and return the response text.
+
+    Posts straight to /v1/chat/completions through the shared aiohttp
+    session — the SDK's httpx transport degrades past ~50 in-flight calls.
+    Structured Outputs still constrains decoding to the DetailedRating
+    schema; parse_rating validates the body on the way back in.
 
-def evaluate_with_llm(submission: WritingSubmission) -> tuple[Optional[DetailedRating], Dict]:
+    The completion is streamed and the connection dropped as soon as the
+    JSON object closes (brace depth back to zero), so trailing tokens and
+    the final SSE bookkeeping never cost latency.
+    """
+    payload = {
+        "model": OPENAI_MODEL,
+        "messages": [{"role": "system", "content": SYSTEM_MESSAGE},
+                     {"role": "user", "content": prompt}],
+        "temperature": 0,
+        "max_tokens": 350,
+        "response_format": {"type": "json_schema",
+                            "json_schema": {"name": "DetailedRating",
+                                            "schema": DetailedRating.model_json_schema()}},
+        "stream": True
+    }
+    await openai_rpm_bucket.acquire()
+    await openai_tpm_bucket.acquire(estimate_tokens(SYSTEM_MESSAGE + prompt) + 350)
+
+    buf = []
+    scanner = _JsonDepthScanner()
+    async with http_session.post(OPENAI_CHAT_COMPLETIONS_URL,
+                                 headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
+                                 json=payload) as resp:
+        resp.raise_for_status()
+        async for raw_line in resp.content:
+            line = raw_line.decode().strip()
+            if not line.startswith("data: "):
+                continue
+            data = line[len("data: "):]
+            if data == "[DONE]":
+                break
+            chunk = orjson.loads(data)
+            choices = chunk.get("choices")
+            if not choices:
+                continue
+            token = choices[0].get("delta", {}).get("content")
+            if not token:
+                continue
+            buf.append(token)
+            if scanner.feed(token):
+                break
+    return "".join(buf)
+
+async def ollama_token_stream(ollama_client, prompt: str):
+    """Yield Llama 3.2 response tokens from a semaphore-guarded chat stream.
+
+    Streams the completion token-by-token so the event loop is released
+    between chunks instead of blocking until Ollama finishes server-side.
+    The semaphore holds for the life of the stream so concurrency stays
+    within OLLAMA_NUM_PARALLEL.
+    """
+    async with ollama_semaphore:
+        stream = await ollama_client.chat(model="llama3.2",
+                                          messages=[{"role": "system", "content": SYSTEM_MESSAGE},
+                                                    {"role": "user", "content": prompt}],
+                                          format=DetailedRating.model_json_schema(), stream=True)
+        async for chunk in stream:
+            yield chunk['message']['content']
+
+@llm_retry
+async def call_ollama(ollama_client, prompt: str) -> str:
+    """Issue one Llama 3.2 chat completion and return the raw response text."""
+    return ''.join([token async for token in ollama_token_stream(ollama_client, prompt)])
+
+def submission_cache_key(submission: WritingSubmission) -> str:
+    """Hash the fields that determine a rating into a compact cache key."""
+    raw = f"{submission.task_type}|{submission.model.lower()}|{submission.question}|{submission.response}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+def parse_rating(response_content: str) -> DetailedRating:
+    """Parse a model's JSON response body into a DetailedRating."""
+    # JSON mode guarantees a parseable body; trim to the outermost braces
+    # only if the model slipped in surrounding text anyway
+    if not response_content.lstrip().startswith("{"):
+        response_content = response_content[response_content.find('{'):response_content.rfind('}') + 1]
+
+    return DetailedRating.model_validate(orjson.loads(response_content))
+
+def build_prompt(submission: WritingSubmission) -> str:
+    """Fill the per-submission fields into the static prompt template."""
+    return PROMPT_TEMPLATE.format_map({
+        "task_type": submission.task_type,
+        "question": submission.question,
+        "word_count": count_words(submission.response),
+        "response": submission.response,
+    })
+
+async def evaluate_with_llm(submission: WritingSubmission, http_session, ollama_client) -> tuple[Optional[DetailedRating], Dict]:
     """Use OpenAI or Ollama (Llama3.2) to evaluate the writing submission."""
     model_name = submission.model.lower()  # Ensure lowercase handling
     debug_info = {}
-    word_count = count_words(submission.response)
-    
-    prompt = f"""
-    You are a certified IELTS examiner, assessing the following {submission.task_type} response according to official IELTS scoring criteria.
-
-    ### **IELTS Assessment Criteria:**
-    - **Task Achievement** (For Task 1) / **Task Response** (For Task 2): Relevance, clarity, and completeness of the answer.
-    - **Coherence & Cohesion**: Logical organization, paragraphing, and use of linking words.
-    - **Lexical Resource**: Range, accuracy, and appropriateness of vocabulary.
-    - **Grammatical Range & Accuracy**: Variety and correctness of sentence structures.
-    - **Overall Band Score**: The final IELTS writing band score (0-9, increments of 0.5).
-
-    ---
-    ### **Task Question:**
-    {submission.question}
-
-    ### **Student Response ({word_count} words):**
-    {submission.response}
-
-    ---
-    ### **Instructions:**
-    - **Rate the response fairly** based on **IELTS standards**, avoiding extreme scores unless justified.
-    - Provide a **detailed but concise** explanation for each category.
-    - Ensure **balanced feedback** with both strengths and weaknesses.
-    - Assign **scores in 0.5 increments** to match IELTS standards.
-
-    ---
-    ### **Return JSON Format** (Use realistic scores and feedback):
-    {{
-    "task_achievement": {{ 
-        "score": [realistic_score], 
-        "feedback": "[Explain how well the response answers the question. Mention strengths and areas for improvement.]" 
-    }},
-    "coherence_cohesion": {{ 
-        "score": [realistic_score], 
-        "feedback": "[Assess logical flow, paragraphing, and use of linking words. Highlight improvements.]" 
-    }},
-    "lexical_resource": {{ 
-        "score": [realistic_score], 
-        "feedback": "[Evaluate vocabulary range and accuracy. Mention strong word choices and any misused words.]" 
-    }},
-    "grammatical_range": {{ 
-        "score": [realistic_score], 
-        "feedback": "[Review sentence structures, grammatical errors, and complexity. Suggest improvements.]" 
-    }},
-    "overall_score": [realistic_overall_score],
-    "overall_feedback": "[Summarize the response quality, key strengths, and areas for improvement.]"
-    }}
-    """
 
+    cache_key = submission_cache_key(submission)
+    cached = rating_cache.get(cache_key)
+    if cached is not None:
+        rating_cache.move_to_end(cache_key)
+        debug_info["cache"] = "hit"
+        return cached, debug_info
+
+    # Single-flight: if an identical submission is already being evaluated,
+    # wait for its result instead of issuing a duplicate LLM call
+    existing = inflight.get(cache_key)
+    if existing is not None:
+        rating = await existing
+        if rating is None:
+            debug_info["error_message"] = "LLM evaluation failed."
+        else:
+            debug_info["cache"] = "coalesced"
+        return rating, debug_info
+
+    future = asyncio.get_running_loop().create_future()
+    inflight[cache_key] = future
 
     try:
+        prompt = build_prompt(submission)
+
         if model_name == "chatgpt":
-            import openai
             if not OPENAI_API_KEY:
                 raise ValueError("OPENAI_API_KEY environment variable is not set.")
-            
-            client = openai.OpenAI(api_key=OPENAI_API_KEY)
-
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role": "system", "content": "You are an IELTS examiner."},
-                          {"role": "user", "content": prompt}],
-                temperature=0.2,
-                max_tokens=500
-            )
-            response_content = response.choices[0].message.content
+
+            response_content = await call_openai(http_session, prompt)
 
         elif model_name == "llama3.2":
-            # ✅ Use Ollama's Python SDK instead of HTTP requests
-            response = ollama.chat(model="llama3.2", messages=[{"role": "user", "content": prompt}])
-            response_content = response['message']['content']  # Extract text response
+            # ✅ Use Ollama's async Python SDK instead of HTTP requests
+            response_content = await call_ollama(ollama_client, prompt)
 
         else:
             raise ValueError("Invalid model selection. Choose 'chatGPT' or 'llama3.2'.")
 
         debug_info["response_preview"] = response_content[:200] + "..." if len(response_content) > 200 else response_content
-        
-        # Extract JSON response
-        json_match = re.search(r'({[\s\S]*})', response_content)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            raise ValueError("Could not extract JSON from model response")
-        
-        rating_data = json.loads(json_str)
-        
-        return DetailedRating(
-            task_achievement=Criterion(score=float(rating_data["task_achievement"]["score"]), feedback=rating_data["task_achievement"]["feedback"]),
-            coherence_cohesion=Criterion(score=float(rating_data["coherence_cohesion"]["score"]), feedback=rating_data["coherence_cohesion"]["feedback"]),
-            lexical_resource=Criterion(score=float(rating_data["lexical_resource"]["score"]), feedback=rating_data["lexical_resource"]["feedback"]),
-            grammatical_range=Criterion(score=float(rating_data["grammatical_range"]["score"]), feedback=rating_data["grammatical_range"]["feedback"]),
-            overall_score=float(rating_data["overall_score"]),
-            overall_feedback=rating_data["overall_feedback"]
-        ), debug_info
+
+        rating = parse_rating(response_content)
+
+        rating_cache[cache_key] = rating
+        rating_cache.move_to_end(cache_key)
+        while len(rating_cache) > RATING_CACHE_SIZE:
+            rating_cache.popitem(last=False)
+
+        future.set_result(rating)
+        return rating, debug_info
 
     except Exception as e:
         logger.error(f"Error using LLM ({model_name}): {type(e).__name__}: {str(e)}")
         debug_info["error_message"] = str(e)
+        # Waiters get None, matching this function's own failure contract
+        future.set_result(None)
         return None, debug_info
 
+    finally:
+        inflight.pop(cache_key, None)
+        # CancelledError (e.g. the owning client disconnected) bypasses the
+        # except clause above; resolve the future so waiters don't hang
+        if not future.done():
+            future.set_result(None)
+
 @app.post("/rate", response_model=RatingResponse)
-async def rate_writing(submission: WritingSubmission = Body(...), debug_mode: bool = False):
+async def rate_writing(request: Request, submission: WritingSubmission = Body(...), debug_mode: bool = False):
     """Rate an IELTS writing task submission using OpenAI or Ollama."""
     try:
-        rating, debug_info = evaluate_with_llm(submission)
+        rating, debug_info = await evaluate_with_llm(submission, request.app.state.http_session, request.app.state.ollama_client)
         if rating is None:
             raise HTTPException(status_code=500, detail="LLM evaluation failed.")
         response = {"rating": rating}
@@ -181,5 +475,152 @@ async def rate_writing(submission: WritingSubmission = Body(...), debug_mode: bo
         logger.error(f"Error in rate_writing endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/rate_stream")
+async def rate_stream(request: Request, submission: WritingSubmission = Body(...)):
+    """Stream a Llama 3.2 evaluation as server-sent events.
+
+    Emits a "delta" event per generated token and a final "rating" event
+    with the parsed DetailedRating, so clients can show progress instead
+    of waiting for the full completion.
+    """
+    if submission.model.lower() != "llama3.2":
+        raise HTTPException(status_code=400, detail="Streaming is only supported for the llama3.2 model.")
+
+    ollama_client = request.app.state.ollama_client
+    prompt = build_prompt(submission)
+
+    async def event_stream():
+        buf = []
+        try:
+            async for token in ollama_token_stream(ollama_client, prompt):
+                buf.append(token)
+                yield f"event: delta\ndata: {orjson.dumps({'content': token}).decode()}\n\n"
+            rating = parse_rating(''.join(buf))
+            yield f"event: rating\ndata: {rating.model_dump_json()}\n\n"
+        except Exception as e:
+            logger.error(f"Error in rate_stream endpoint: {str(e)}")
+            yield f"event: error\ndata: {orjson.dumps({'detail': str(e)}).decode()}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.post("/rate_batch")
+async def rate_batch(request: Request, batch: BatchSubmission = Body(...), mode: str = "realtime"):
+    """Rate a batch of IELTS writing submissions.
+
+    With mode="realtime" (default), submissions fan out concurrently and
+    results come back in input order, with an error object in place of a
+    rating for submissions that failed. With mode="batch", the batch is
+    queued on OpenAI's Batch API (half the token cost, completion within
+    24 h) and a batch_id is returned for polling via GET /rate_batch/{batch_id}.
+    """
+    if mode == "batch":
+        return await submit_openai_batch(request.app.state.openai_client, batch.items)
+
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def rate_one(submission: WritingSubmission):
+        async with semaphore:
+            return await evaluate_with_llm(submission, request.app.state.http_session, request.app.state.ollama_client)
+
+    results = await asyncio.gather(*(rate_one(s) for s in batch.items), return_exceptions=True)
+
+    response = []
+    for result in results:
+        if isinstance(result, Exception):
+            response.append({"rating": None, "error": str(result)})
+        else:
+            rating, debug_info = result
+            if rating is None:
+                response.append({"rating": None, "error": debug_info.get("error_message", "LLM evaluation failed.")})
+            else:
+                response.append({"rating": rating})
+    return response
+
+async def submit_openai_batch(openai_client, items: List[WritingSubmission]):
+    """Queue submissions on OpenAI's Batch API and return the batch id."""
+    if openai_client is None:
+        raise HTTPException(status_code=400, detail="OPENAI_API_KEY environment variable is not set.")
+    if any(s.model.lower() != "chatgpt" for s in items):
+        raise HTTPException(status_code=400, detail="mode='batch' only supports the chatGPT model.")
+
+    # One JSONL line per submission; custom_id records the input position so
+    # results can be re-ordered when the output file comes back
+    lines = []
+    for i, submission in enumerate(items):
+        lines.append(orjson.dumps({
+            "custom_id": f"submission-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": OPENAI_MODEL,
+                "messages": [{"role": "system", "content": SYSTEM_MESSAGE},
+                             {"role": "user", "content": build_prompt(submission)}],
+                "temperature": 0,
+                "max_tokens": 350,
+                "response_format": {"type": "json_schema",
+                                    "json_schema": {"name": "DetailedRating",
+                                                    "schema": DetailedRating.model_json_schema()}}
+            }
+        }))
+
+    input_file = await openai_client.files.create(
+        file=("rate_batch.jsonl", io.BytesIO(b"\n".join(lines))),
+        purpose="batch"
+    )
+    batch = await openai_client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    return {"batch_id": batch.id, "status": batch.status}
+
+@app.get("/rate_batch/{batch_id}")
+async def get_batch_results(request: Request, batch_id: str):
+    """Poll an OpenAI batch; once complete, return the parsed ratings in input order."""
+    openai_client = request.app.state.openai_client
+    if openai_client is None:
+        raise HTTPException(status_code=400, detail="OPENAI_API_KEY environment variable is not set.")
+
+    batch = await openai_client.batches.retrieve(batch_id)
+    if batch.status != "completed":
+        return {"batch_id": batch.id, "status": batch.status}
+
+    # Successes land in output_file_id, API-level failures in error_file_id;
+    # either can be null (e.g. output_file_id when every request failed)
+    entries = {}
+
+    async def collect(file_id: Optional[str]):
+        if not file_id:
+            return
+        output = await openai_client.files.content(file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            entry = orjson.loads(line)
+            index = int(entry["custom_id"].rsplit("-", 1)[1])
+            error = entry.get("error")
+            if error:
+                entries[index] = {"rating": None, "error": error.get("message", str(error))}
+                continue
+            try:
+                content = entry["response"]["body"]["choices"][0]["message"]["content"]
+                entries[index] = {"rating": parse_rating(content)}
+            except Exception as e:
+                entries[index] = {"rating": None, "error": str(e)}
+
+    await collect(batch.output_file_id)
+    await collect(batch.error_file_id)
+
+    # Pad any index neither file accounted for so results stay aligned
+    total = batch.request_counts.total if batch.request_counts else (max(entries, default=-1) + 1)
+    results = [entries.get(i, {"rating": None, "error": "No result returned for this submission."})
+               for i in range(total)]
+
+    return {"batch_id": batch.id, "status": batch.status, "results": results}
+
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
+    # uvloop + httptools cut per-request event-loop and parser overhead versus
+    # the stdlib defaults; reload stays off since it forces a single worker
+    uvicorn.run("app:app", host="0.0.0.0", port=8000,
+                loop="uvloop", http="httptools",
+                workers=WORKERS, reload=False)
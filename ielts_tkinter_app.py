@@ -1,45 +1,98 @@
+import json
+import threading
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import requests
 
 API_URL = "http://localhost:8000/rate"
+STREAM_URL = "http://localhost:8000/rate_stream"
+
+# Persistent session so repeated submissions reuse one keep-alive connection
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
 
 def submit_task():
     task_type = task_type_var.get()
     model_name = model_var.get()  # Get selected model
     question = question_text.get("1.0", tk.END).strip()
     response = response_text.get("1.0", tk.END).strip()
-    
+
     if not question or not response:
         messagebox.showerror("Input Error", "Both question and response fields must be filled.")
         return
-    
+
     data = {
         "task_type": task_type,
         "question": question,
         "response": response,
         "model": model_name  # Include selected model
     }
-    
+
+    # Run the API call off the Tk main thread so the UI stays responsive.
+    # The llama3.2 path streams over SSE so feedback appears as it generates.
+    submit_btn.config(state=tk.DISABLED)
+    target = _do_stream_call if model_name == "llama3.2" else _do_call
+    threading.Thread(target=target, args=(data,), daemon=True).start()
+
+def _do_call(data):
     try:
-        response = requests.post(API_URL, json=data)
+        response = SESSION.post(API_URL, json=data, timeout=120)
         response.raise_for_status()
         rating = response.json()["rating"]
-        
-        feedback_text.config(state=tk.NORMAL)
-        feedback_text.delete("1.0", tk.END)
-        feedback_text.insert(tk.END, f"Overall Score: {rating['overall_score']}\n\n", "title")
-        feedback_text.insert(tk.END, f"Feedback: {rating['overall_feedback']}\n\n", "normal")
-        
-        for criterion, details in rating.items():
-            if isinstance(details, dict):
-                feedback_text.insert(tk.END, f"{criterion.replace('_', ' ').title()}:\n", "subtitle")
-                feedback_text.insert(tk.END, f"- Score: {details['score']}\n", "bold")
-                feedback_text.insert(tk.END, f"- Feedback: {details['feedback']}\n\n", "normal")
-        
-        feedback_text.config(state=tk.DISABLED)
+        root.after(0, _render, rating)
+    except requests.exceptions.RequestException as e:
+        root.after(0, _show_error, str(e))
+
+def _do_stream_call(data):
+    try:
+        with SESSION.post(STREAM_URL, json=data, timeout=120, stream=True) as response:
+            response.raise_for_status()
+            root.after(0, _begin_stream)
+            event = None
+            for raw_line in response.iter_lines():
+                line = raw_line.decode()
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: "):
+                    payload = json.loads(line[len("data: "):])
+                    if event == "delta":
+                        root.after(0, _append_delta, payload["content"])
+                    elif event == "rating":
+                        root.after(0, _render, payload)
+                    elif event == "error":
+                        root.after(0, _show_error, payload.get("detail", "LLM evaluation failed."))
     except requests.exceptions.RequestException as e:
-        messagebox.showerror("API Error", f"Failed to get feedback: {str(e)}")
+        root.after(0, _show_error, str(e))
+
+def _begin_stream():
+    feedback_text.config(state=tk.NORMAL)
+    feedback_text.delete("1.0", tk.END)
+    feedback_text.config(state=tk.DISABLED)
+
+def _append_delta(token):
+    feedback_text.config(state=tk.NORMAL)
+    feedback_text.insert(tk.END, token, "normal")
+    feedback_text.see(tk.END)
+    feedback_text.config(state=tk.DISABLED)
+
+def _render(rating):
+    feedback_text.config(state=tk.NORMAL)
+    feedback_text.delete("1.0", tk.END)
+    feedback_text.insert(tk.END, f"Overall Score: {rating['overall_score']}\n\n", "title")
+    feedback_text.insert(tk.END, f"Feedback: {rating['overall_feedback']}\n\n", "normal")
+
+    for criterion, details in rating.items():
+        if isinstance(details, dict):
+            feedback_text.insert(tk.END, f"{criterion.replace('_', ' ').title()}:\n", "subtitle")
+            feedback_text.insert(tk.END, f"- Score: {details['score']}\n", "bold")
+            feedback_text.insert(tk.END, f"- Feedback: {details['feedback']}\n\n", "normal")
+
+    feedback_text.config(state=tk.DISABLED)
+    submit_btn.config(state=tk.NORMAL)
+
+def _show_error(message):
+    submit_btn.config(state=tk.NORMAL)
+    messagebox.showerror("API Error", f"Failed to get feedback: {message}")
 
 # Tkinter GUI Setup
 root = tk.Tk()
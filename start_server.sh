@@ -0,0 +1,17 @@
+#!/usr/bin/env bash
+# Start the Ollama server with request parallelism enabled, then the FastAPI
+# backend. Without OLLAMA_NUM_PARALLEL the Ollama server serializes requests,
+# so the async fan-out in app.py would gain nothing on the llama3.2 path.
+set -e
+
+export OLLAMA_NUM_PARALLEL="${OLLAMA_NUM_PARALLEL:-4}"
+export OLLAMA_MAX_LOADED_MODELS="${OLLAMA_MAX_LOADED_MODELS:-1}"
+export OLLAMA_KEEP_ALIVE="${OLLAMA_KEEP_ALIVE:-24h}"
+
+if ! curl -sf http://localhost:11434/ > /dev/null 2>&1; then
+    echo "Starting ollama serve (OLLAMA_NUM_PARALLEL=$OLLAMA_NUM_PARALLEL)..."
+    ollama serve &
+    sleep 2
+fi
+
+python app.py